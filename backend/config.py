@@ -1,9 +1,74 @@
 # ──────────────────────────────────────────────────────────────────────────────
 # config.py
 # ──────────────────────────────────────────────────────────────────────────────
-from pydantic import BaseModel
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import ClassVar
 
-class Settings(BaseModel):
+# Tables statiques figées au niveau module (lecture seule, jamais copiées ni revalidées)
+_GPU_FILTERS = MappingProxyType({
+    "AC1_codes": ("AC1",),   # Abords MH
+    "AC2_codes": ("AC2",),   # Sites classés / inscrits
+    "AC4_codes": ("AC4",),   # SPR
+    "PPR_prefix": "PPR",
+    "EBC_codes": ("01",),
+    "paysage_keywords": ("paysage", "élément", "remarquable", "patrimoine végétal"),
+})
+
+_INPN_LAYERS_WFS = MappingProxyType({})
+
+_ATLAS_LAYERS = MappingProxyType({
+    "SPR": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:site_patrimonial_remarquable",
+        "pretty": "Sites patrimoniaux remarquables",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "ZPPAUP_AVAP": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:zppaup_avap",
+        "pretty": "ZPPAUP / AVAP",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "MH_classes": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:monument_historique_classe",
+        "pretty": "Monuments historiques classés",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "MH_inscrits": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:monument_historique_inscrit",
+        "pretty": "Monuments historiques inscrits",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "Abords_MH": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:abords_monument_historique",
+        "pretty": "Abords MH (500 m ou périmètre délimité)",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "Sites_classes": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:site_classe",
+        "pretty": "Sites classés",
+        "source": "Atlas des Patrimoines WFS"
+    }),
+    "Sites_inscrits": MappingProxyType({
+        "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
+        "typename": "mh:site_inscrit",
+        "pretty": "Sites inscrits",
+        "source": "Atlas des Patrimoines WFS"
+    })
+})
+
+_CORS_ALLOW_ORIGINS = ("*",)
+
+# Valeurs statiques, lues seulement : dataclass figée à slots (ni schéma ni validation)
+@dataclass(frozen=True, slots=True)
+class Settings:
     # =========================================================================
     # 1) IGN — Parcellaire Express (Feuilles cadastrales, WFS public)
     # =========================================================================
@@ -14,6 +79,9 @@ class Settings(BaseModel):
     # Aliases "legacy" (compat avec backend/main.py)
     cadastre_wfs_base: str = ign_base
     cadastre_typename: str = ign_feuille_typename
+    # propertyName des recherches de feuille par point (ex. "code_dep,code_com,com_abs,section,feuille") :
+    # évite de télécharger la géométrie ; None = tous les attributs
+    cadastre_feuille_properties: str | None = None
 
     # =========================================================================
     # 2) GPU (Géoportail de l’Urbanisme) — API Carto (REST)
@@ -21,67 +89,17 @@ class Settings(BaseModel):
     gpu_base: str = "https://apicarto.ign.fr/api/gpu"
     gpu_typename: str = "zone-urba"
 
-    gpu_filters: dict = {
-        "AC1_codes": ["AC1"],   # Abords MH
-        "AC2_codes": ["AC2"],   # Sites classés / inscrits
-        "AC4_codes": ["AC4"],   # SPR
-        "PPR_prefix": "PPR",
-        "EBC_codes": ["01"],
-        "paysage_keywords": ["paysage", "élément", "remarquable", "patrimoine végétal"],
-    }
+    gpu_filters: ClassVar[Mapping] = _GPU_FILTERS
 
     # =========================================================================
     # 3) INPN (WFS publics) — Natura 2000, ZNIEFF, ZICO
     # =========================================================================
-    inpn_layers_wfs: dict = {}
+    inpn_layers_wfs: ClassVar[Mapping] = _INPN_LAYERS_WFS
 
     # =========================================================================
     # 4) Atlas des Patrimoines — couches WFS
     # =========================================================================
-    atlas_layers: dict = {
-        "SPR": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:site_patrimonial_remarquable",
-            "pretty": "Sites patrimoniaux remarquables",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "ZPPAUP_AVAP": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:zppaup_avap",
-            "pretty": "ZPPAUP / AVAP",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "MH_classes": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:monument_historique_classe",
-            "pretty": "Monuments historiques classés",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "MH_inscrits": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:monument_historique_inscrit",
-            "pretty": "Monuments historiques inscrits",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "Abords_MH": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:abords_monument_historique",
-            "pretty": "Abords MH (500 m ou périmètre délimité)",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "Sites_classes": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:site_classe",
-            "pretty": "Sites classés",
-            "source": "Atlas des Patrimoines WFS"
-        },
-        "Sites_inscrits": {
-            "base": "https://data.culture.gouv.fr/wfs/atlas_patrimoines",
-            "typename": "mh:site_inscrit",
-            "pretty": "Sites inscrits",
-            "source": "Atlas des Patrimoines WFS"
-        }
-    }
+    atlas_layers: ClassVar[Mapping] = _ATLAS_LAYERS
 
     atlas_geom_field: str = "geom"
 
@@ -93,6 +111,18 @@ class Settings(BaseModel):
     # =========================================================================
     # 6) CORS
     # =========================================================================
-    cors_allow_origins: list[str] = ["*"]
+    cors_allow_origins: ClassVar[tuple[str, ...]] = _CORS_ALLOW_ORIGINS
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Instance unique des réglages, construite au premier appel.
+    backend/main.py la lit et en dérive ses constantes à l'import : la changer ensuite n'a aucun effet.
+    """
+    return Settings()
 
-CONFIG = Settings()
+def __getattr__(name: str):
+    # Compat : `from .config import CONFIG` reste possible, sans instanciation à l'import
+    if name == "CONFIG":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,22 +1,86 @@
 # backend/main.py
 import os
+import time
+import hashlib
+import asyncio
 import re
-import json
 import math
 import zipfile
+from collections import OrderedDict
+from array import array
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, wraps
 from typing import Any, Dict, List, Tuple
+from urllib.parse import urlencode, quote
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Body, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import httpx
-from pyproj import Transformer
-from xml.etree import ElementTree as ET
-
-from .config import CONFIG
+import numpy as np
+import orjson
+from scipy.spatial import cKDTree
+from shapely.geometry import Point, shape
+from shapely.prepared import prep
+from lxml import etree as ET
+
+from .config import get_settings
+
+CONFIG = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Client HTTP partagé (pool keep-alive + HTTP/2) pour tous les appels WFS / GPU
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=20,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60),
+    )
+    # Préchargement best-effort des aérodromes (les erreurs remontent à la 1re requête)
+    try:
+        _load_airports()
+    except Exception:
+        pass
+    # Warm-up des connexions vers tous les services amont, en tâche de fond
+    bases = {WFS_BASE, APICARTO_GPU_BASE, GPU_API_BASE, CONFIG.gpu_base}
+    bases |= {meta["base"] for meta in (getattr(CONFIG, "inpn_layers_wfs", {}) or {}).values()}
+    warmup = asyncio.gather(*(_wfs_warmup(b) for b in bases if b))
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        await app.state.http.aclose()
 
-load_dotenv()
-app = FastAPI(title="Site GEO — MVP sans base")
+class ORJSONResponse(JSONResponse):
+    """
+    Réponses JSON sérialisées par orjson (Rust) plutôt que json.dumps.
+    Les endpoints à grosses réponses (props WFS, hits GPU) la renvoient explicitement :
+    FastAPI saute alors le passage par jsonable_encoder.
+    datetime/UUID sont sérialisés nativement (RFC 3339) ; Decimal ne l'est pas (aucun ici).
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+_PUBLIC_MAX_AGE_S = 3600
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match : '*' ou liste d'ETags séparés par des virgules, comparaison faible (préfixe W/ ignoré)."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+def _public_json(request: Request, content: dict) -> Response:
+    """JSON cacheable par navigateurs/CDN (max-age + ETag, 304 si If-None-Match correspond)."""
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2s(body, digest_size=8).hexdigest()}"'
+    headers = {"Cache-Control": f"public, max-age={_PUBLIC_MAX_AGE_S}", "ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+app = FastAPI(title="Site GEO — MVP sans base", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # --- CORS ---
 app.add_middleware(
@@ -27,57 +91,117 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Projections ---
-_transform_wgs84_to_l93 = Transformer.from_crs("EPSG:4326", "EPSG:2154", always_xy=True)
-
 # --- Constantes / défauts (cadastre) ---
 WFS_VERSION = "2.0.0"
 WFS_BASE = getattr(CONFIG, "cadastre_wfs_base", "https://data.geopf.fr/wfs/ows")
 TYPENAME_FEUILLE = getattr(CONFIG, "cadastre_typename", "CADASTRALPARCELS.PARCELLAIRE_EXPRESS:feuille")
+FEUILLE_PROPERTIES = getattr(CONFIG, "cadastre_feuille_properties", None)
 # Nouveau : couche parcelle
 TYPENAME_PARCELLE = "CADASTRALPARCELS.PARCELLAIRE_EXPRESS:parcelle"
 CADASTRE_MILLESIME = getattr(CONFIG, "cadastre_millesime", "2025-04-01")
 
 # Helper: lecture de props tolérante à la casse / alias
-def _pick(props: dict, *keys, default=None):
-    """Retourne props[k] en tolérant maj/min et alias, sinon default."""
+def _lc(props: dict) -> dict:
+    """Propriétés indexées en minuscules, à construire une fois par feature avant les _pick."""
+    return {str(k).lower(): v for k, v in (props or {}).items()}
+
+def _pick(props_lc: dict, *keys, default=None):
+    """Retourne la valeur du premier alias présent dans props_lc (cf. _lc ; alias en minuscules), sinon default."""
     for k in keys:
-        if k in props:
-            return props[k]
-        lk, uk = k.lower(), k.upper()
-        if lk in props:
-            return props[lk]
-        if uk in props:
-            return props[uk]
+        if k in props_lc:
+            return props_lc[k]
     return default
 
 # -------------------------
 #    Helpers HTTP / WFS
 # -------------------------
+
+# Cache mémoire des réponses amont (cadastre / PLU / SUP quasi statiques) ; TTL pour suivre les millésimes
+UPSTREAM_CACHE_TTL_S = 24 * 3600
+_COORD_DECIMALS = 5  # ~1 m : deux points aussi proches partagent la même entrée
+
+def _qpt(lon: float, lat: float) -> tuple[float, float]:
+    return round(lon, _COORD_DECIMALS), round(lat, _COORD_DECIMALS)
+
+def _geom_key(geom: dict) -> tuple:
+    """Clé hashable d'une géométrie GeoJSON, coordonnées arrondies."""
+    flat = []
+    stack = [geom.get("coordinates")]
+    while stack:
+        c = stack.pop()
+        if isinstance(c, (list, tuple)):
+            stack.extend(c)
+        else:
+            flat.append(round(c, _COORD_DECIMALS))
+    return geom.get("type"), tuple(flat)
+
+def _async_ttl_cache(key, maxsize: int = 1024, ttl: float = UPSTREAM_CACHE_TTL_S):
+    """
+    LRU à expiration pour coroutines ; key(*args) construit la clé.
+    Seuls les succès sont mis en cache. Les valeurs sont partagées : ne pas les muter.
+    Single-flight : les appels concurrents de même clé attendent la même requête amont.
+    """
+    def deco(fn):
+        cache: OrderedDict = OrderedDict()
+        inflight: dict = {}
+
+        def _done(k, fut: asyncio.Future):
+            inflight.pop(k, None)
+            if fut.cancelled() or fut.exception() is not None:
+                return  # erreur lue ici, remontée aux appelants via await
+            cache[k] = (time.monotonic(), fut.result())
+            cache.move_to_end(k)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @wraps(fn)
+        async def wrapper(*args):
+            k = key(*args)
+            hit = cache.get(k)
+            if hit is not None and time.monotonic() - hit[0] < ttl:
+                cache.move_to_end(k)
+                return hit[1]
+            fut = inflight.get(k)
+            if fut is None:
+                fut = inflight[k] = asyncio.ensure_future(fn(*args))
+                fut.add_done_callback(lambda f, k=k: _done(k, f))
+            # shield : l'annulation d'un appelant n'annule pas la requête partagée
+            return await asyncio.shield(fut)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return deco
+
 def build_wfs_url(base: str, params: dict) -> str:
-    """Ajoute correctement les paramètres que base contienne ou non déjà un '?map='."""
-    qp = str(httpx.QueryParams(params))
+    """Ajoute correctement les paramètres que base contienne ou non déjà un '?map='. Les None sont omis."""
+    qp = urlencode([(k, v) for k, v in params.items() if v is not None], quote_via=quote)
     return f"{base}&{qp}" if "?" in base else f"{base}?{qp}"
 
-def wfs_shapezip_url(base: str, typename: str, lon: float, lat: float, version: str = WFS_VERSION) -> str:
-    """Génère une URL WFS shape-zip avec INTERSECTS (pour GeoServer/IGN) – via build_wfs_url (gère '?map=')."""
-    params = {
+@lru_cache(maxsize=64)
+def make_wfs_builder(base: str, typename: str, version: str = WFS_VERSION):
+    """
+    Spécialise l'URL WFS shape-zip (INTERSECTS) pour un couple (base, typename) :
+    la partie fixe est encodée une fois, seul le point varie ensuite.
+    """
+    prefix = build_wfs_url(base, {
         "service": "WFS",
         "version": version,
         "request": "GetFeature",
         "typeNames": typename,
         "outputFormat": "shape-zip",
         "srsName": "EPSG:4326",
-        "CQL_FILTER": f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))",
-    }
-    return build_wfs_url(base, params)
+    }) + "&CQL_FILTER=" + quote("INTERSECTS(geom,SRID=4326;POINT(", safe="")
+    suffix = quote("))", safe="")
+    return lambda lon, lat: f"{prefix}{lon}%20{lat}{suffix}"
+
+def wfs_shapezip_url(base: str, typename: str, lon: float, lat: float, version: str = WFS_VERSION) -> str:
+    """Génère une URL WFS shape-zip avec INTERSECTS (pour GeoServer/IGN) – gère '?map=' via build_wfs_url."""
+    return make_wfs_builder(base, typename, version)(lon, lat)
 
-# Petit warm-up best-effort (utilisé pour WFS publics si besoin)
+# Petit warm-up best-effort : un HEAD suffit à ouvrir la connexion (TCP/TLS, HTTP/2) dans le pool
 async def _wfs_warmup(base: str):
     try:
-        url = build_wfs_url(base, {"SERVICE": "WFS", "REQUEST": "GetCapabilities"})
-        async with httpx.AsyncClient(timeout=10) as client:
-            await client.get(url)
+        await app.state.http.head(base, timeout=5)
     except Exception:
         pass
 
@@ -90,35 +214,64 @@ def health():
     return {"status": "ok"}
 
 # ---------- DXF-PCI FEUILLE (DGFiP) ----------
-def _feuille_feature_by_point(lon: float, lat: float) -> dict:
-    base_params = {
+# Avance laissée à la 1re requête (INTERSECTS, presque toujours fructueuse) avant de lancer les replis
+_PROBE_HEAD_START_S = 0.15
+
+async def _first_non_empty(primary, *fallbacks) -> list:
+    """
+    Lance primary seule ; les replis ne partent que si elle revient vide ou n'a pas répondu
+    après _PROBE_HEAD_START_S. Renvoie le premier résultat non vide dans l'ordre de priorité
+    donné (pas dans l'ordre d'arrivée) ; les requêtes restantes sont annulées.
+    Une erreur n'est propagée que si elle survient avant un résultat non vide.
+    """
+    tasks = [asyncio.ensure_future(primary)]
+    try:
+        await asyncio.wait(tasks, timeout=_PROBE_HEAD_START_S)
+        if tasks[0].done() and (res := tasks[0].result()):
+            return res
+        tasks += [asyncio.ensure_future(c) for c in fallbacks]
+        for t in tasks:
+            res = await t
+            if res:
+                return res
+        return []
+    finally:
+        if len(tasks) == 1:
+            for c in fallbacks:
+                c.close()  # replis jamais lancés
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+            elif not t.cancelled():
+                t.exception()  # erreur éventuelle marquée comme lue
+
+@lru_cache(maxsize=8)
+def _cadastre_cql_prefix(typename: str, count: int | None = 1, properties: str | None = None) -> str:
+    """Partie fixe de l'URL GetFeature cadastre par CQL_FILTER, encodée une fois par (typename, count, properties)."""
+    return build_wfs_url(WFS_BASE, {
         "service": "WFS",
         "version": WFS_VERSION,
         "request": "GetFeature",
-        "typeNames": TYPENAME_FEUILLE,
+        "typeNames": typename,
         "srsName": "EPSG:4326",
         "outputFormat": "application/json",
-    }
-
-    def _call(params):
-        r = httpx.get(WFS_BASE, params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        return data.get("features", [])
-
-    # 1) INTERSECTS
-    p1 = dict(base_params, CQL_FILTER=f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))")
-    feats = _call(p1)
-
-    # 2) DWITHIN (mini buffer)
-    if not feats:
-        p2 = dict(base_params, CQL_FILTER=f"DWITHIN(geom,SRID=4326;POINT({lon} {lat}),0.5,meters)")
-        feats = _call(p2)
-
-    # 3) CONTAINS
-    if not feats:
-        p3 = dict(base_params, CQL_FILTER=f"CONTAINS(geom,SRID=4326;POINT({lon} {lat}))")
-        feats = _call(p3)
+        "count": count,  # 1 : seule la 1re feature est lue ; None : toutes
+        "propertyName": properties,  # None : tous les attributs, géométrie comprise
+    }) + "&CQL_FILTER="
+
+async def _cadastre_features(typename: str, cql: str, count: int | None = 1, properties: str | None = None) -> list:
+    r = await app.state.http.get(_cadastre_cql_prefix(typename, count, properties) + quote(cql, safe=""))
+    r.raise_for_status()
+    return orjson.loads(r.content).get("features", [])
+
+@_async_ttl_cache(key=_qpt)
+async def _feuille_feature_by_point(lon: float, lat: float) -> dict:
+    # INTERSECTS, puis DWITHIN (mini buffer), puis CONTAINS : replis lancés ensemble si INTERSECTS tarde ou est vide
+    feats = await _first_non_empty(
+        _cadastre_features(TYPENAME_FEUILLE, f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))", properties=FEUILLE_PROPERTIES),
+        _cadastre_features(TYPENAME_FEUILLE, f"DWITHIN(geom,SRID=4326;POINT({lon} {lat}),0.5,meters)", properties=FEUILLE_PROPERTIES),
+        _cadastre_features(TYPENAME_FEUILLE, f"CONTAINS(geom,SRID=4326;POINT({lon} {lat}))", properties=FEUILLE_PROPERTIES),
+    )
 
     if not feats:
         raise HTTPException(status_code=404, detail="Aucune feuille trouvée pour ce point.")
@@ -130,13 +283,13 @@ def _normalize_section(sec: str) -> str:
     s = str(sec).strip().upper()
     return s if len(s) != 1 else "0" + s  # ex. "C" -> "0C"
 
-def _dxf_feuille_url(props: dict) -> str:
-    code_dep = str(_pick(props, "CODE_DEP", "code_dep", "dep")).zfill(2)
-    code_com = str(_pick(props, "CODE_COM", "code_com", "com")).zfill(3)
-    com_abs  = _pick(props, "COM_ABS", "com_abs")
+def _dxf_feuille_url(p: dict) -> str:
+    code_dep = str(_pick(p, "code_dep", "dep")).zfill(2)
+    code_com = str(_pick(p, "code_com", "com")).zfill(3)
+    com_abs  = _pick(p, "com_abs")
     com_abs  = str(com_abs if com_abs is not None else "000").zfill(3)
-    section  = _normalize_section(_pick(props, "SECTION", "section"))
-    feuille  = str(_pick(props, "FEUILLE", "feuille")).zfill(2)
+    section  = _normalize_section(_pick(p, "section"))
+    feuille  = str(_pick(p, "feuille")).zfill(2)
 
     insee = f"{code_dep}{code_com}"
     filecode = f"{code_dep}{code_com}{com_abs}{section}{feuille}"
@@ -147,28 +300,70 @@ def _dxf_feuille_url(props: dict) -> str:
 
 @app.get("/sheet/by-point")
 async def sheet_by_point(
+    request: Request,
     lon: float = Query(...),
     lat: float = Query(...),
     debug: bool = Query(False)
 ):
-    props = _feuille_feature_by_point(lon, lat)
-    url = _dxf_feuille_url(props)
+    props = await _feuille_feature_by_point(lon, lat)
+    payload = _sheet_payload(_lc(props))
+    if debug:
+        payload["wfs_props"] = props
+    return _public_json(request, payload)
 
-    sec_for_id = _normalize_section(_pick(props, "SECTION", "section"))
-    payload = {
-        "download_url": url,
+def _sheet_payload(p: dict) -> dict:
+    sec_for_id = _normalize_section(_pick(p, "section"))
+    return {
+        "download_url": _dxf_feuille_url(p),
         "id_feuille": (
-            f'{_pick(props,"CODE_DEP","code_dep")}'
-            f'{_pick(props,"CODE_COM","code_com")}'
-            f'{_pick(props,"COM_ABS","com_abs") or "000"}'
+            f'{_pick(p, "code_dep")}'
+            f'{_pick(p, "code_com")}'
+            f'{_pick(p, "com_abs") or "000"}'
             f'{sec_for_id}'
-            f'{str(_pick(props,"FEUILLE","feuille")).zfill(2)}'
+            f'{str(_pick(p, "feuille")).zfill(2)}'
         ),
         "source": "DGFiP — PCI vecteur DXF (feuille entière)",
     }
-    if debug:
-        payload["wfs_props"] = props
-    return payload
+
+_SHEET_BATCH_MAX = 500
+_SHEET_BATCH_CHUNK = 40  # points par GetFeature : garde le CQL_FILTER (donc l'URL) sous ~4 Ko
+
+async def _feuilles_for_points(pts: list[tuple[float, float]]) -> list[dict | None]:
+    """
+    Un seul GetFeature (INTERSECTS ... OR ...) pour un lot de points ; chaque point est ensuite
+    rattaché localement (shapely) à la feuille qui le contient. None si aucune ne le couvre.
+    """
+    cql = " OR ".join(f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))" for lon, lat in pts)
+    feats = await _cadastre_features(TYPENAME_FEUILLE, cql, count=None) or []
+    sheets = [(prep(shape(f["geometry"])), f.get("properties") or {}) for f in feats if f.get("geometry")]
+    return [next((props for g, props in sheets if g.intersects(Point(lon, lat))), None) for lon, lat in pts]
+
+@app.post("/sheet/by-points")
+async def sheet_by_points(
+    points: List[Tuple[float, float]] = Body(..., description="Points [lon, lat] à rattacher à leur feuille"),
+):
+    """Version lot de /sheet/by-point : une requête WFS par paquet de points au lieu d'une par point."""
+    if len(points) > _SHEET_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Au plus {_SHEET_BATCH_MAX} points par requête")
+
+    chunks = [points[i:i + _SHEET_BATCH_CHUNK] for i in range(0, len(points), _SHEET_BATCH_CHUNK)]
+    found = [props for part in await asyncio.gather(*(_feuilles_for_points(c) for c in chunks)) for props in part]
+
+    # Points non couverts (bordure de feuille…) : repli unitaire DWITHIN / CONTAINS, mis en cache
+    missing = [i for i, props in enumerate(found) if props is None]
+    fallback = await asyncio.gather(*(_feuille_feature_by_point(*points[i]) for i in missing), return_exceptions=True)
+    for i, res in zip(missing, fallback):
+        found[i] = res
+
+    results = []
+    for props in found:
+        if isinstance(props, HTTPException):
+            results.append({"error": props.detail})
+        elif isinstance(props, BaseException):
+            raise props
+        else:
+            results.append(_sheet_payload(_lc(props)))
+    return ORJSONResponse({"results": results})
 
 # ---------- PARCEL INFO GPU ----------
 @app.get("/parcel-info/by-point")
@@ -176,18 +371,19 @@ async def parcel_info_by_point(
     lon: float = Query(...),
     lat: float = Query(...)
 ):
-    props = _feuille_feature_by_point(lon, lat)
-    code_dep = str(_pick(props, "CODE_DEP", "code_dep")).zfill(2)
-    code_com = str(_pick(props, "CODE_COM", "code_com")).zfill(3)
-    com_abs  = str(_pick(props, "COM_ABS", "com_abs") or "000").zfill(3)
+    props = await _feuille_feature_by_point(lon, lat)
+    p = _lc(props)
+    code_dep = str(_pick(p, "code_dep")).zfill(2)
+    code_com = str(_pick(p, "code_com")).zfill(3)
+    com_abs  = str(_pick(p, "com_abs") or "000").zfill(3)
     prefixe  = "000"  # généralement 000
-    section  = _normalize_section(_pick(props, "SECTION", "section"))
-    numero   = str(_pick(props, "NUMERO", "numero")).zfill(4)
+    section  = _normalize_section(_pick(p, "section"))
+    numero   = str(_pick(p, "numero")).zfill(4)
 
     parcel_id = f"{code_dep}_{code_com}_{com_abs}_{prefixe}_{section}_{numero}"
     gpu_url = f"https://www.geoportail-urbanisme.gouv.fr/map/parcel-info/{parcel_id}/"
 
-    return {
+    return ORJSONResponse({
         "code_dep": code_dep,
         "code_com": code_com,
         "com_abs": com_abs,
@@ -197,36 +393,20 @@ async def parcel_info_by_point(
         "gpu_url": gpu_url,
         "source": "Géoportail de l’Urbanisme (parcel-info)",
         "wfs_props": props
-    }
+    })
 
 
 # ---------- (NOUVEAU) LIEN GPU "parcel-info" ----------
-def _parcelle_feature_by_point(lon: float, lat: float) -> dict:
+@_async_ttl_cache(key=_qpt)
+async def _parcelle_feature_by_point(lon: float, lat: float) -> dict:
     """
     Récupère la parcelle intersectant le point.
     """
-    base_params = {
-        "service": "WFS",
-        "version": WFS_VERSION,
-        "request": "GetFeature",
-        "typeNames": TYPENAME_PARCELLE,
-        "srsName": "EPSG:4326",
-        "outputFormat": "application/json",
-    }
-
-    def _call(params):
-        r = httpx.get(WFS_BASE, params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        return data.get("features", [])
-
-    # Essais : INTERSECTS puis petit buffer
-    p1 = dict(base_params, CQL_FILTER=f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))")
-    feats = _call(p1)
-
-    if not feats:
-        p2 = dict(base_params, CQL_FILTER=f"DWITHIN(geom,SRID=4326;POINT({lon} {lat}),0.5,meters)")
-        feats = _call(p2)
+    # Essais : INTERSECTS puis petit buffer (lancé si INTERSECTS tarde ou est vide)
+    feats = await _first_non_empty(
+        _cadastre_features(TYPENAME_PARCELLE, f"INTERSECTS(geom,SRID=4326;POINT({lon} {lat}))"),
+        _cadastre_features(TYPENAME_PARCELLE, f"DWITHIN(geom,SRID=4326;POINT({lon} {lat}),0.5,meters)"),
+    )
 
     if not feats:
         raise HTTPException(status_code=404, detail="Aucune parcelle trouvée pour ce point.")
@@ -257,16 +437,17 @@ async def gpu_parcel_link_by_point(
     Format attendu : /map/parcel-info/{dep}_{com}_{com_abs}_{prefixe}_{section}_{numero}/
     Exemple fourni : .../map/parcel-info/34_032_000_000_LX_0209/
     """
-    props = _parcelle_feature_by_point(lon, lat)
+    props = await _parcelle_feature_by_point(lon, lat)
+    p = _lc(props)
 
-    code_dep = str(_pick(props, "CODE_DEP", "code_dep", "dep")).zfill(2)
-    code_com = str(_pick(props, "CODE_COM", "code_com", "com")).zfill(3)
-    com_abs  = _pick(props, "COM_ABS", "com_abs")
+    code_dep = str(_pick(p, "code_dep", "dep")).zfill(2)
+    code_com = str(_pick(p, "code_com", "com")).zfill(3)
+    com_abs  = _pick(p, "com_abs")
     com_abs  = str(com_abs if com_abs is not None else "000").zfill(3)
 
-    prefixe  = _normalize_prefixe(_pick(props, "PREFIXE", "prefixe"))
-    section  = _normalize_section(_pick(props, "SECTION", "section"))
-    numero   = _normalize_numero(_pick(props, "NUMERO", "numero", "PARCELLE", "parcelle"))
+    prefixe  = _normalize_prefixe(_pick(p, "prefixe"))
+    section  = _normalize_section(_pick(p, "section"))
+    numero   = _normalize_numero(_pick(p, "numero", "parcelle"))
 
     gpu_url = (
         "https://www.geoportail-urbanisme.gouv.fr/map/parcel-info/"
@@ -285,7 +466,7 @@ async def gpu_parcel_link_by_point(
     }
     if debug:
         out["wfs_props"] = props
-    return out
+    return ORJSONResponse(out)
 
 # ---------- PLU (zonage) ----------
 @app.get("/plu/by-point")
@@ -295,13 +476,12 @@ async def plu_by_point(lon: float = Query(...), lat: float = Query(...)):
 
     api_url = f"{CONFIG.gpu_base}/{CONFIG.gpu_typename}"
     geom_geojson = {"type": "Point", "coordinates": [lon, lat]}
-    params = {"geom": json.dumps(geom_geojson)}
+    params = {"geom": orjson.dumps(geom_geojson).decode()}
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        r = await client.get(api_url, params=params)
-        if r.status_code != 200:
-            raise HTTPException(status_code=500, detail=f"Erreur API GPU: {r.text}")
-        data = r.json()
+    r = await app.state.http.get(api_url, params=params, timeout=15)
+    if r.status_code != 200:
+        raise HTTPException(status_code=500, detail=f"Erreur API GPU: {r.text}")
+    data = orjson.loads(r.content)
 
     feats = data.get("features", [])
     if not feats:
@@ -321,9 +501,9 @@ async def plu_by_point(lon: float = Query(...), lat: float = Query(...)):
             v = props.get(k)
             if isinstance(v, str) and v.startswith("http"):
                 urls.append(v)
-        partition = props.get("partition") or props.get("Partition")
-        gpu_doc_id = props.get("gpu_doc_id") or props.get("gpuDocId") or props.get("gpu_docid")
-        nomfic = props.get("nomfic") or props.get("nomFic") or props.get("nom_fic")
+        partition = _first_truthy(props, _PARTITION_KEYS)
+        gpu_doc_id = _first_truthy(props, ("gpu_doc_id", "gpuDocId", "gpu_docid"))
+        nomfic = _first_truthy(props, ("nomfic", "nomFic", "nom_fic"))
         if partition and gpu_doc_id and nomfic:
             suffix = nomfic if str(nomfic).lower().endswith(".pdf") else f"{nomfic}.pdf"
             urls.append(f"https://data.geopf.fr/annexes/gpu/documents/{partition}/{gpu_doc_id}/{suffix}")
@@ -335,7 +515,7 @@ async def plu_by_point(lon: float = Query(...), lat: float = Query(...)):
 
     reglement_urls = _gpu_build_reglement_urls_from_props(props)
 
-    return {
+    return ORJSONResponse({
         "zone_code": zone_code,
         "libelle_long": props.get("libelong"),
         "nature": props.get("nature"),
@@ -344,49 +524,58 @@ async def plu_by_point(lon: float = Query(...), lat: float = Query(...)):
         "atom_links": [],
         "reglement_pdfs": reglement_urls,
         "raw": props
-    }
+    })
 
 # ---------- RÈGLEMENT GRAPHIQUE (plans de zonage) ----------
 GPU_API_BASE = "https://www.geoportail-urbanisme.gouv.fr/api"  # Swagger v5.x (files/details)
 APICARTO_GPU_BASE = getattr(CONFIG, "gpu_base", "https://apicarto.ign.fr/api/gpu")
 
+_GRAPHIC_KEYS = (
+    "règlement graphique", "reglement graphique",
+    "plan de zonage", "plans de zonage", "planche",
+    "rg_", "rg-", "_rg", "zonage_", "zonage-"
+)
+
+_LOCATING_KEYS = ("repérage", "reperage", "index des planches", "plan d'assemblage", "assemblage des planches")
+
 def _looks_like_graphic_plan(title: str, filename: str | None = None) -> bool:
     t = (title or "").lower()
     f = (filename or "").lower()
     hay = f"{t} {f}"
-    keys = [
-        "règlement graphique", "reglement graphique",
-        "plan de zonage", "plans de zonage", "planche",
-        "rg_", "rg-", "_rg", "zonage_", "zonage-"
-    ]
-    return any(k in hay for k in keys)
+    return any(k in hay for k in _GRAPHIC_KEYS)
 
+@_async_ttl_cache(key=_qpt)
 async def _apicarto_zone_urba_by_point(lon: float, lat: float) -> dict | None:
     url = f"{APICARTO_GPU_BASE}/zone-urba"
     geom = {"type": "Point", "coordinates": [lon, lat]}
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url, params={"geom": json.dumps(geom)})
-        r.raise_for_status()
-        data = r.json()
+    r = await app.state.http.get(url, params={"geom": orjson.dumps(geom).decode()})
+    r.raise_for_status()
+    data = orjson.loads(r.content)
     feats = data.get("features", []); return feats[0] if feats else None
 
+@_async_ttl_cache(key=lambda doc_id: doc_id)
 async def _gpu_list_document_files(doc_id: str) -> list[dict]:
     url = f"{GPU_API_BASE}/document/{doc_id}/files"
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url)
-        if r.status_code == 404:
-            return []
-        r.raise_for_status()
-        return r.json() if isinstance(r.json(), list) else []
+    r = await app.state.http.get(url)
+    if r.status_code == 404:
+        return []
+    r.raise_for_status()
+    data = orjson.loads(r.content)
+    return data if isinstance(data, list) else []
+
+# Alias des champs GPU, par ordre de préférence
+_DOC_ID_KEYS = ("gpu_doc_id", "gpuDocId", "iddocument", "idDocument", "doc_id", "document")
+_PARTITION_KEYS = ("partition", "Partition")
+_ZONE_KEYS = ("libelle", "libelleZone", "LIBELLE")
+
+def _first_truthy(props: dict, keys: tuple[str, ...]):
+    """Première valeur non vide parmi les alias keys (équivalent d'une chaîne de props.get(...) or ...)."""
+    return next((v for v in map(props.get, keys) if v), None)
 
 def _extract_doc_id_and_zone(props: dict) -> tuple[str | None, str | None, str | None]:
-    gpu_doc_id = (
-        props.get("gpu_doc_id") or props.get("gpuDocId") or
-        props.get("iddocument") or props.get("idDocument") or
-        props.get("doc_id") or props.get("document")
-    )
-    partition = props.get("partition") or props.get("Partition")
-    zone_code = props.get("libelle") or props.get("libelleZone") or props.get("LIBELLE")
+    gpu_doc_id = _first_truthy(props, _DOC_ID_KEYS)
+    partition = _first_truthy(props, _PARTITION_KEYS)
+    zone_code = _first_truthy(props, _ZONE_KEYS)
     return str(gpu_doc_id) if gpu_doc_id else None, str(partition) if partition else None, str(zone_code) if zone_code else None
 
 @app.get("/plu/graphic/by-point")
@@ -417,7 +606,7 @@ async def plu_graphic_by_point(
         url = f.get("url") or f.get("href") or f.get("downloadUrl") or ""
         ftype = (f.get("type") or f.get("category") or "").lower()
         filename = (f.get("fileName") or f.get("filename") or "")
-        is_graphic_typed = any(k in ftype for k in ["reglement_graphique", "reglement-graphique", "document_graphique", "graphique"])
+        is_graphic_typed = "graphique" in ftype  # couvre reglement_graphique, reglement-graphique, document_graphique
         is_graphic_guessed = _looks_like_graphic_plan(title, filename)
         if (is_graphic_typed or is_graphic_guessed) and url.startswith("http"):
             items.append({"title": title, "type": ftype, "url": url, "filename": filename})
@@ -435,7 +624,7 @@ async def plu_graphic_by_point(
     locating = []
     for f in files:
         title = (f.get("title") or f.get("nom") or "").lower()
-        if any(k in title for k in ["repérage", "reperage", "index des planches", "plan d'assemblage", "assemblage des planches"]):
+        if any(k in title for k in _LOCATING_KEYS):
             u = f.get("url") or f.get("href") or ""
             if u.startswith("http"):
                 locating.append({"title": f.get("title") or f.get("nom"), "url": u})
@@ -452,69 +641,91 @@ async def plu_graphic_by_point(
     }
 
 # ---------- WFS generic (réutilisé pour INPN & ex-Atlas) ----------
+_INV_M_PER_DEG_LAT = 1.0 / 110_574.0
+
 def _bbox_deg_around_point(lon: float, lat: float, radius_m: float = 7.5) -> Tuple[float, float, float, float]:
-    dlat = radius_m / 110_574.0
+    dlat = radius_m * _INV_M_PER_DEG_LAT
     dlon = radius_m / (111_320.0 * math.cos(math.radians(lat)) or 1e-6)
     return (lon - dlon, lat - dlat, lon + dlon, lat + dlat)
 
-async def _wfs_hits_by_bbox(base: str, typename: str, lon: float, lat: float) -> dict:
-    minx, miny, maxx, maxy = _bbox_deg_around_point(lon, lat, radius_m=7.5)
-
-    # Essai 1 : WFS 1.0.0
-    params1 = {
-        "SERVICE": "WFS", "VERSION": "1.0.0", "REQUEST": "GetFeature",
-        "TYPENAME": typename, "SRS": "EPSG:4326", "OUTPUTFORMAT": "geojson",
-        "BBOX": f"{minx},{miny},{maxx},{maxy}",
-    }
-    url1 = build_wfs_url(base, params1)
+# Clés candidates pour le libellé d'une feature, par ordre de préférence (INPN : le nom d'abord)
+_LABEL_KEYS = ("nom", "Nom", "NOM", "libelle", "LIBELLE", "intitule", "INTITULE",
+               "appellation", "APPELLATION", "titre", "TITRE", "denomination", "DENOMINATION")
+_SUP_LABEL_KEYS = ("libelle", "LIBELLE", "nom", "NOM", "intitule", "INTITULE",
+                   "appellation", "APPELLATION", "titre", "TITRE", "denomination", "DENOMINATION")
 
-    features = []
-    try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            r1 = await client.get(url1)
-        r1.raise_for_status()
-        data = r1.json()
-        features = data.get("features", [])
-    except Exception:
-        # Essai 2 : WFS 2.0.0
-        params2 = {
-            "SERVICE": "WFS", "VERSION": "2.0.0", "REQUEST": "GetFeature",
+def _best_label(props: Dict[str, Any], keys: tuple[str, ...]) -> str:
+    for k in keys:
+        v = props.get(k)
+        if v:
+            return str(v)
+    # Repli (rare) : première propriété scalaire non vide
+    for k, v in props.items():
+        if isinstance(v, (str, int, float)) and str(v).strip():
+            return f"{k}: {v}"
+    return "(sans libellé)"
+
+# Nombre de hits détaillés renvoyés par couche (les compteurs restent exhaustifs)
+_MAX_HITS = 10
+
+# (base, typename) -> version WFS qui a répondu ; oubliée au premier échec
+_WFS_VERSIONS = ("1.0.0", "2.0.0")
+_WFS_VERSION_CACHE: dict[tuple[str, str], str] = {}
+
+@lru_cache(maxsize=64)
+def _wfs_bbox_prefix(base: str, typename: str, version: str) -> str:
+    """Partie fixe de l'URL GetFeature par BBOX, encodée une fois par (base, typename, version)."""
+    if version == "1.0.0":
+        params = {
+            "SERVICE": "WFS", "VERSION": "1.0.0", "REQUEST": "GetFeature",
+            "TYPENAME": typename, "SRS": "EPSG:4326", "OUTPUTFORMAT": "geojson",
+        }
+    else:
+        params = {
+            "SERVICE": "WFS", "VERSION": version, "REQUEST": "GetFeature",
             "TYPENAMES": typename, "SRSNAME": "EPSG:4326",
             "OUTPUTFORMAT": "application/json",
-            "BBOX": f"{minx},{miny},{maxx},{maxy}",
         }
-        url2 = build_wfs_url(base, params2)
-        try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                r2 = await client.get(url2)
-            r2.raise_for_status()
-            data2 = r2.json()
-            features = data2.get("features", [])
-        except Exception:
-            features = []
-
-    def best_label(props: Dict[str, Any]) -> str:
-        for k in ("nom","Nom","NOM","libelle","LIBELLE","intitule","INTITULE",
-                  "appellation","APPELLATION","titre","TITRE","denomination","DENOMINATION"):
-            if k in props and props[k]:
-                return str(props[k])
-        for k, v in props.items():
-            if isinstance(v, (str, int, float)) and str(v).strip():
-                return f"{k}: {v}"
-        return "(sans libellé)"
+    return build_wfs_url(base, params) + "&BBOX="
 
+@_async_ttl_cache(key=lambda base, typename, lon, lat: (base, typename, *_qpt(lon, lat)))
+async def _wfs_hits_by_bbox(base: str, typename: str, lon: float, lat: float) -> dict:
+    minx, miny, maxx, maxy = _bbox_deg_around_point(lon, lat, radius_m=7.5)
+    bbox = quote(f"{minx},{miny},{maxx},{maxy}", safe="")
+
+    # Version connue d'abord ; sinon 1.0.0 puis 2.0.0
+    key = (base, typename)
+    known = _WFS_VERSION_CACHE.get(key)
+    versions = (known, *(v for v in _WFS_VERSIONS if v != known)) if known else _WFS_VERSIONS
+
+    last_exc: Exception | None = None
+    for version in versions:
+        try:
+            r = await app.state.http.get(_wfs_bbox_prefix(base, typename, version) + bbox)
+            r.raise_for_status()
+            features = orjson.loads(r.content).get("features", [])
+        except Exception as e:
+            _WFS_VERSION_CACHE.pop(key, None)
+            last_exc = e
+            continue
+        _WFS_VERSION_CACHE[key] = version
+        break
+    else:
+        # Aucune version n'a répondu : on lève, pour ne pas mettre en cache un faux « aucun hit »
+        raise last_exc
+
+    # Seuls les _MAX_HITS premiers sont exposés : inutile de construire (et garder en cache) le reste
     out = []
-    for f in features:
+    for f in features[:_MAX_HITS]:
         props = (f.get("properties") or {})
-        out.append({"id": f.get("id"), "label": best_label(props), "properties": props})
-    return {"count": len(out), "features": out}
+        out.append({"id": f.get("id"), "label": _best_label(props, _LABEL_KEYS), "properties": props})
+    return {"count": len(features), "features": out}
 
 # ---------- INPN (WFS) : Natura 2000, ZNIEFF, ZICO ----------
 @app.get("/inpn/summary/by-point")
 async def inpn_summary_by_point(
     lon: float = Query(...),
     lat: float = Query(...),
-    warmup: bool = Query(True, description="GetCapabilities avant GetFeature (best-effort)")
 ):
     layers_cfg = getattr(CONFIG, "inpn_layers_wfs", {}) or {}
     if not layers_cfg:
@@ -523,49 +734,89 @@ async def inpn_summary_by_point(
             "layers": {}
         }
 
-    results = {}; total_hits = 0
-    for key, meta in layers_cfg.items():
+    async def _layer(key: str, meta: dict) -> dict:
         base = meta["base"]; tname = meta["typename"]
         pretty = meta.get("pretty", key); source = meta.get("source", "INPN WFS")
         try:
-            if warmup:
-                await _wfs_warmup(base)
             res = await _wfs_hits_by_bbox(base, tname, lon, lat)
-            results[key] = {"pretty": pretty, "source": source, "count": res["count"], "hits": res["features"][:10]}
-            total_hits += res["count"]
+            return {"pretty": pretty, "source": source, "count": res["count"], "hits": res["features"][:_MAX_HITS]}
         except Exception as e:
-            results[key] = {"pretty": pretty, "source": source, "count": 0, "hits": [], "error": str(e)}
+            return {"pretty": pretty, "source": source, "count": 0, "hits": [], "error": str(e)}
+
+    # Couches indépendantes : interrogées en parallèle
+    layer_results = await asyncio.gather(*(_layer(k, m) for k, m in layers_cfg.items()))
+    results = dict(zip(layers_cfg.keys(), layer_results))
+    total_hits = sum(r["count"] for r in layer_results)
 
-    return {"any_hit": total_hits > 0, "total_hits": total_hits, "layers": results}
+    return ORJSONResponse({"any_hit": total_hits > 0, "total_hits": total_hits, "layers": results})
 
 # ---------- GPU (REST) : SUP & PLU (EBC/paysage) ----------
+@_async_ttl_cache(key=lambda path, geom_point: (path, _geom_key(geom_point)), maxsize=4096)
 async def _gpu_get(path: str, geom_point: dict) -> dict:
     url = f"{APICARTO_GPU_BASE}/{path}"
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url, params={"geom": json.dumps(geom_point)})
-        r.raise_for_status()
-        return r.json()
+    r = await app.state.http.get(url, params={"geom": orjson.dumps(geom_point).decode()})
+    r.raise_for_status()
+    data = orjson.loads(r.content)
+    # Seuls id/properties sont lus : on ne garde pas les géométries (souvent l'essentiel du volume) en cache
+    return {"features": [
+        {"id": f.get("id"), "properties": f.get("properties")} for f in (data.get("features") or [])
+    ]}
+
+async def _gpu_features(paths: tuple[str, ...] | list[str], geom_point: dict) -> list[dict]:
+    """Interroge plusieurs couches GPU en parallèle ; les couches en erreur sont ignorées."""
+    results = await asyncio.gather(*(_gpu_get(p, geom_point) for p in paths), return_exceptions=True)
+    feats: list[dict] = []
+    for data in results:
+        if isinstance(data, BaseException):
+            continue  # toutes les communes n'ont pas toutes les couches
+        feats.extend(data.get("features") or [])
+    return feats
+
+_SUP_PATHS = ("assiette-sup-s", "assiette-sup-l", "assiette-sup-p")
+
+async def _sup_assiettes(geom: dict) -> list[dict]:
+    """
+    Assiettes SUP (surfaciques, linéaires, ponctuelles) : code de requête commun aux résumés GPU
+    et patrimoine. Leurs géométries diffèrent (tampon de 25 m / point), donc pas de cache partagé.
+    """
+    return await _gpu_features(_SUP_PATHS, geom)
 
 def _norm(s):
     return (str(s or "")).strip()
 
-def _has_paysage(words: list[str], *vals: str) -> bool:
+# Filtres GPU normalisés une fois pour toutes (la config est figée)
+_F = CONFIG.gpu_filters
+_AC1_CODES = frozenset(c.upper() for c in _F["AC1_codes"])
+_AC2_CODES = frozenset(c.upper() for c in _F["AC2_codes"])
+_AC4_CODES = frozenset(c.upper() for c in _F["AC4_codes"])
+_PPR_PREFIX = str(_F["PPR_prefix"]).upper()
+_EBC_CODES = frozenset(_F.get("EBC_codes", ()))
+_PAYSAGE_WORDS = tuple(w.lower() for w in _F.get("paysage_keywords", ()))
+del _F
+
+def _has_paysage(words: tuple[str, ...], *vals: str) -> bool:
+    """`words` doit être déjà en minuscules (cf. _PAYSAGE_WORDS)."""
     blob = " ".join(_norm(v).lower() for v in vals)
-    return any(w.lower() in blob for w in words)
+    return any(w in blob for w in words)
 
 # --- NOUVEAU: petit disque WGS84 pour bufferiser le point (25 m par défaut) ---
+@lru_cache(maxsize=8)
+def _unit_circle(n: int) -> np.ndarray:
+    """(cos, sin) des n sommets du cercle unité, premier sommet répété pour fermer l'anneau."""
+    a = 2 * np.pi * np.arange(n) / n
+    ring = np.column_stack([np.cos(a), np.sin(a)])
+    ring = np.vstack([ring, ring[:1]])
+    ring.flags.writeable = False  # partagé via le cache
+    return ring
+
 def _point_buffer_polygon_wgs84(lon: float, lat: float, radius_m: float = 25.0, n: int = 24) -> dict:
     """
     Disque approx. autour du point en WGS84 pour interroger l'API GPU par polygon.
     """
     dlat = radius_m / 111_320.0
     dlon = radius_m / (111_320.0 * max(math.cos(math.radians(lat)), 1e-6))
-    coords = []
-    for i in range(n):
-        a = 2 * math.pi * i / n
-        coords.append([lon + dlon * math.cos(a), lat + dlat * math.sin(a)])
-    coords.append(coords[0])
-    return {"type": "Polygon", "coordinates": [coords]}
+    ring = _unit_circle(n) * (dlon, dlat) + (lon, lat)
+    return {"type": "Polygon", "coordinates": [ring.tolist()]}
 
 @app.get("/gpu/summary/by-point")
 async def gpu_summary_by_point(
@@ -574,21 +825,15 @@ async def gpu_summary_by_point(
 ):
     # Utilise un POLYGON (buffer 25 m) pour éviter les faux négatifs sur limites
     geom_point = _point_buffer_polygon_wgs84(lon, lat, radius_m=25.0)
-    F = CONFIG.gpu_filters
-
-    # 1) SUP — assiettes (S/L/P)
-    sup_paths = ["assiette-sup-s", "assiette-sup-l", "assiette-sup-p"]
-    sup_features: list[dict] = []
-    for p in sup_paths:
-        try:
-            data = await _gpu_get(p, geom_point)
-            sup_features.extend(data.get("features") or [])
-        except Exception:
-            # on continue: toutes les communes n'ont pas toutes les assiettes
-            pass
 
-    def prop(f, *keys):
-        return _pick((f.get("properties") or {}), *keys)
+    # SUP (assiettes S/L/P) + PLU (prescriptions / informations) : 9 requêtes indépendantes, en parallèle
+    pres_paths = ["prescription-s", "prescription-l", "prescription-p"]
+    info_paths = ["information-s", "information-l", "information-p"]
+    sup_features, pres_features, info_features = await asyncio.gather(
+        _sup_assiettes(geom_point),
+        _gpu_features(pres_paths, geom_point),
+        _gpu_features(info_paths, geom_point),
+    )
 
     sup_buckets = {
         "AC1": {"pretty": "Abords MH (AC1)", "source": "API Carto GPU", "items": []},
@@ -598,39 +843,22 @@ async def gpu_summary_by_point(
     }
 
     for f in sup_features:
-        code = prop(f, "sup_code", "categorie_code", "code", "CODE", "categorie")
-        label = prop(f, "libelle", "LIBELLE", "nom", "NOM", "intitule", "INTITULE") or "(sans libellé)"
+        p = _lc(f.get("properties"))
+        code = _pick(p, "sup_code", "categorie_code", "code", "categorie")
+        label = _pick(p, "libelle", "nom", "intitule") or "(sans libellé)"
         rec = {"id": f.get("id"), "label": str(label), "properties": f.get("properties") or {}}
 
         scode = str(code or "").upper().strip()
-        if scode in set(map(str.upper, F["AC1_codes"])):
+        if scode in _AC1_CODES:
             sup_buckets["AC1"]["items"].append(rec)
-        elif scode in set(map(str.upper, F["AC2_codes"])):
+        elif scode in _AC2_CODES:
             sup_buckets["AC2"]["items"].append(rec)
-        elif scode in set(map(str.upper, F["AC4_codes"])):
+        elif scode in _AC4_CODES:
             sup_buckets["AC4"]["items"].append(rec)
-        elif scode.startswith(str(F["PPR_prefix"]).upper()):
+        elif scode.startswith(_PPR_PREFIX):
             sup_buckets["PPR"]["items"].append(rec)
 
     # 2) PLU — prescriptions / informations → EBC & éléments de paysage
-    pres_paths = ["prescription-s", "prescription-l", "prescription-p"]
-    info_paths = ["information-s", "information-l", "information-p"]
-    pres_features: list[dict] = []; info_features: list[dict] = []
-
-    for p in pres_paths:
-        try:
-            data = await _gpu_get(p, geom_point)
-            pres_features.extend(data.get("features") or [])
-        except Exception:
-            pass
-
-    for p in info_paths:
-        try:
-            data = await _gpu_get(p, geom_point)
-            info_features.extend(data.get("features") or [])
-        except Exception:
-            pass
-
     buckets_plu = {
         "EBC": {"pretty": "Espaces boisés classés (EBC)", "source": "API Carto GPU", "items": []},
         "PAYSAGE": {"pretty": "Éléments/paysage à préserver", "source": "API Carto GPU", "items": []},
@@ -638,20 +866,22 @@ async def gpu_summary_by_point(
 
     # EBC par code (p.ex. "01") sur prescriptions
     for f in pres_features:
-        code = prop(f, "code", "CODE", "type_code", "typeCode")
-        label = prop(f, "libelle", "LIBELLE", "nom", "NOM", "intitule", "INTITULE") or "(sans libellé)"
+        p = _lc(f.get("properties"))
+        code = _pick(p, "code", "type_code", "typecode")
+        label = _pick(p, "libelle", "nom", "intitule") or "(sans libellé)"
         rec = {"id": f.get("id"), "label": str(label), "properties": f.get("properties") or {}}
-        if str(code or "").strip() in F.get("EBC_codes", []):
+        if str(code or "").strip() in _EBC_CODES:
             buckets_plu["EBC"]["items"].append(rec)
-        elif _has_paysage(F.get("paysage_keywords", []), label, code):
+        elif _has_paysage(_PAYSAGE_WORDS, label, code):
             buckets_plu["PAYSAGE"]["items"].append(rec)
 
     # Informations : on cherche des indices de paysage/éléments remarquables
     for f in info_features:
-        code = prop(f, "code", "CODE", "type_code", "typeCode")
-        label = prop(f, "libelle", "LIBELLE", "nom", "NOM", "intitule", "INTITULE") or "(sans libellé)"
+        p = _lc(f.get("properties"))
+        code = _pick(p, "code", "type_code", "typecode")
+        label = _pick(p, "libelle", "nom", "intitule") or "(sans libellé)"
         rec = {"id": f.get("id"), "label": str(label), "properties": f.get("properties") or {}}
-        if _has_paysage(F.get("paysage_keywords", []), label, code):
+        if _has_paysage(_PAYSAGE_WORDS, label, code):
             buckets_plu["PAYSAGE"]["items"].append(rec)
 
     # Compose la réponse homogène
@@ -677,24 +907,69 @@ async def gpu_summary_by_point(
             "hits": bucket["items"][:10]
         }
 
-    return {
+    return ORJSONResponse({
         "sup": {"total_hits": total_sup, "layers": out_sup},
         "plu": {"total_hits": total_plu, "layers": out_plu},
         "any_hit": (total_sup + total_plu) > 0
-    }
+    })
 
 # ---------- (Compat) Atlas Patrimoines single-link ----------
-@app.get("/heritage/by-point")
-async def heritage_by_point(lon: float = Query(...), lat: float = Query(...)):
+def _heritage_shapezip_url(lon: float, lat: float) -> str:
     if not getattr(CONFIG, "atlas_layers", None):
         raise HTTPException(status_code=500, detail="Atlas WFS non configuré (atlas_layers vide).")
     # On prend arbitrairement la première couche (compat historique)
     first_key = next(iter(CONFIG.atlas_layers))
     meta = CONFIG.atlas_layers[first_key]
-    url = wfs_shapezip_url(meta["base"], meta["typename"], lon, lat, WFS_VERSION)
-    return {"download_url": url}
+    return wfs_shapezip_url(meta["base"], meta["typename"], lon, lat, WFS_VERSION)
+
+@app.get("/heritage/by-point")
+async def heritage_by_point(lon: float = Query(...), lat: float = Query(...)):
+    return {"download_url": _heritage_shapezip_url(lon, lat)}
+
+_STREAM_CHUNK = 64 * 1024
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """Ferme toujours son itérateur, y compris quand le client coupe en cours de route (ClientDisconnect)."""
+    async def stream_response(self, send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            await self.body_iterator.aclose()
+
+@app.get("/heritage/download/by-point")
+async def heritage_download_by_point(lon: float = Query(...), lat: float = Query(...)):
+    """
+    Relaie le shape-zip de /heritage/by-point par morceaux de 64 Ko :
+    la mémoire reste bornée quelle que soit la taille de l'archive.
+    """
+    client = app.state.http
+    try:
+        resp = await client.send(client.build_request("GET", _heritage_shapezip_url(lon, lat)), stream=True)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"WFS patrimoine : {type(e).__name__}")
+    if resp.is_error:
+        await resp.aclose()
+        raise HTTPException(status_code=502, detail=f"WFS patrimoine : HTTP {resp.status_code}")
+
+    async def _body():
+        # finally : la connexion revient au pool partagé même si le client coupe en cours de route
+        try:
+            async for chunk in resp.aiter_bytes(_STREAM_CHUNK):
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    return _ClosingStreamingResponse(
+        _body(),
+        media_type=resp.headers.get("content-type", "application/zip"),
+        headers={"Content-Disposition": 'attachment; filename="heritage.zip"'},
+    )
 
 # ---------- (NOUVEAU) "Heritage summary" basé GPU uniquement ----------
+# Libellés AC2 : classé(e)(s) / inscrit(e)(s), en début de mot
+_CLASSE_RE = re.compile(r"\bclassé", re.IGNORECASE)
+_INSCRIT_RE = re.compile(r"\binscrit", re.IGNORECASE)
+
 @app.get("/heritage/summary/by-point")
 async def heritage_summary_by_point(
     lon: float = Query(...),
@@ -710,51 +985,33 @@ async def heritage_summary_by_point(
     """
     geom_point = {"type": "Point", "coordinates": [lon, lat]}
 
-    # 1) Récupération des assiettes SUP (S/L/P)
-    sup_paths = ["assiette-sup-s", "assiette-sup-l", "assiette-sup-p"]
-    sup_features: list[dict] = []
-    for p in sup_paths:
-        try:
-            data = await _gpu_get(p, geom_point)
-            sup_features.extend(data.get("features") or [])
-        except Exception:
-            pass  # tolérance: toutes les communes n'ont pas toutes les assiettes
-
-    def _best_label(props: Dict[str, Any]) -> str:
-        for k in ("libelle","LIBELLE","nom","NOM","intitule","INTITULE","appellation","APPELLATION","titre","TITRE","denomination","DENOMINATION"):
-            if props.get(k):
-                return str(props[k])
-        for k, v in (props or {}).items():
-            if isinstance(v, (str, int, float)) and str(v).strip():
-                return f"{k}: {v}"
-        return "(sans libellé)"
-
-    # Buckets
+    # 1) Récupération des assiettes SUP (S/L/P), en parallèle
+    sup_features = await _sup_assiettes(geom_point)
+
+    # Buckets, remplis en une seule passe
     hits_spr: list[dict] = []            # AC4
     hits_abords: list[dict] = []         # AC1
-    ac2_all: list[dict] = []             # AC2 (à séparer en classés/inscrits)
+    sites_classes: list[dict] = []       # AC2 dont le libellé dit classé(e)(s)
+    sites_inscrits: list[dict] = []      # AC2 dont le libellé dit inscrit(e)(s)
 
     for f in sup_features:
         props = (f.get("properties") or {})
-        scode = str(_pick(props, "sup_code", "categorie_code", "code", "CODE", "categorie") or "").upper().strip()
-        label = _best_label(props)
+        scode = str(_pick(_lc(props), "sup_code", "categorie_code", "code", "categorie") or "").upper().strip()
+        if scode not in ("AC4", "AC1", "AC2"):
+            continue
+        label = _best_label(props, _SUP_LABEL_KEYS)
         rec = {"id": f.get("id"), "label": label, "properties": props}
 
         if scode == "AC4":
             hits_spr.append(rec)
         elif scode == "AC1":
             hits_abords.append(rec)
-        elif scode == "AC2":
-            ac2_all.append(rec)
-
-    # Séparer AC2 en "Sites classés" vs "Sites inscrits" par mots-clés du libellé
-    import re as _re
-    def _match_any(s: str, words: list[str]) -> bool:
-        s = (s or "")
-        return any(_re.search(rf"\b{w}\w*", s, flags=_re.IGNORECASE) for w in words)
-
-    sites_classes = [r for r in ac2_all if _match_any(r["label"], ["classé","classée","classés","classées"])]
-    sites_inscrits = [r for r in ac2_all if _match_any(r["label"], ["inscrit","inscrite","inscrits","inscrites"])]
+        else:
+            # AC2 : "Sites classés" vs "Sites inscrits" par mots-clés du libellé
+            if _CLASSE_RE.search(label):
+                sites_classes.append(rec)
+            if _INSCRIT_RE.search(label):
+                sites_inscrits.append(rec)
 
     # MH classés / inscrits → non fournis par l’API GPU (seuls les abords AC1 existent côté SUP)
     mh_classes = []
@@ -811,7 +1068,7 @@ async def heritage_summary_by_point(
     }
 
     total = sum(layers[k]["count"] for k in layers)
-    return {"any_protection": total > 0, "total_hits": total, "layers": layers}
+    return ORJSONResponse({"any_protection": total > 0, "total_hits": total, "layers": layers})
 
 # -------------------------
 #    KMZ/KML: parsing
@@ -828,8 +1085,9 @@ def _resolve_path(p: str) -> str:
         return cand
     raise FileNotFoundError(p)
 
-def _load_kml_root(path: str):
-    path = _resolve_path(path)
+@contextmanager
+def _open_kml(path: str):
+    """Ouvre le KML en flux binaire (ou le .kml interne d'un KMZ, sans l'extraire en mémoire)."""
     if path.lower().endswith(".kmz"):
         with zipfile.ZipFile(path, "r") as zf:
             name = "doc.kml" if "doc.kml" in zf.namelist() else next(
@@ -837,147 +1095,281 @@ def _load_kml_root(path: str):
             )
             if not name:
                 raise ValueError("KMZ sans fichier .kml interne")
-            data = zf.read(name)
-            return ET.fromstring(data)
-    return ET.parse(path).getroot()
+            with zf.open(name) as f:
+                yield f
+    else:
+        with open(path, "rb") as f:
+            yield f
 
 def _float2(s: str):
+    # str.replace renvoie la chaîne elle-même sans virgule : plus rapide ici que str.translate
     try:
         return float(s.replace(",", "."))
-    except Exception:
+    except ValueError:
+        return None
+
+# En deçà, la boucle Python par sommet reste plus rapide que l'aller-retour NumPy
+_COORDS_VEC_MIN = 64
+
+def _coords_block(toks: list[str]) -> np.ndarray | None:
+    """
+    Bloc <coordinates> homogène (tous les sommets en lon,lat ou lon,lat,alt) converti
+    en une seule passe C ; None si le bloc est irrégulier ou contient une valeur invalide.
+    """
+    k = toks[0].count(",") + 1
+    if k < 2 or any(t.count(",") != k - 1 for t in toks):
+        return None
+    try:
+        vals = np.array(",".join(toks).split(","), dtype=np.float64)
+    except ValueError:
         return None
+    return vals.reshape(len(toks), k)[:, :2]
 
-def parse_kml_points(path: str):
-    root = _load_kml_root(path)
-    pts = set()
-
-    for el in root.iter():
-        if el.tag.endswith("coordinates"):
-            text = (el.text or "").strip()
-            if not text:
-                continue
-            for tok in re.split(r"\s+", text):
-                if not tok:
+# Balises utiles (tout namespace : kml:coordinates, gx:coord) ; le reste est ignoré par le parseur
+_KML_TAGS = ("{*}coordinates", "{*}coord", "{*}Placemark")
+
+@lru_cache(maxsize=4)
+def _parse_kml_cached(path: str, mtime: float) -> np.ndarray:
+    """
+    Parse en flux (lxml.iterparse, filtré côté C sur les seules balises utiles) ;
+    mémoïsé par (chemin, mtime) pour ne relire le fichier que s'il change.
+    Les Placemark traités sont libérés : mémoire bornée quelle que soit la taille du KML.
+    """
+    lons = array("d"); lats = array("d")
+    blocks: list[np.ndarray] = []  # gros blocs <coordinates> vectorisés
+    with _open_kml(path) as f:
+        for _, el in ET.iterparse(f, events=("end",), tag=_KML_TAGS):
+            tag = el.tag.rpartition("}")[2]  # localname, sans objet QName
+            if tag == "coordinates":
+                toks = (el.text or "").split()
+                block = _coords_block(toks) if len(toks) >= _COORDS_VEC_MIN else None
+                if block is not None:
+                    blocks.append(block)
                     continue
-                parts = tok.split(",")
+                for tok in toks:
+                    lon_s, _, rest = tok.partition(",")
+                    lat_s, _, _ = rest.partition(",")
+                    lon = _float2(lon_s); lat = _float2(lat_s)
+                    if lon is not None and lat is not None:
+                        lons.append(lon); lats.append(lat)
+            elif tag == "coord":
+                parts = (el.text or "").split()
                 if len(parts) >= 2:
                     lon = _float2(parts[0]); lat = _float2(parts[1])
                     if lon is not None and lat is not None:
-                        pts.add((lon, lat))
-
-    for el in root.iter():
-        if el.tag.endswith("coord"):
-            text = (el.text or "").strip()
-            if not text:
-                continue
-            parts = re.split(r"\s+", text)
-            if len(parts) >= 2:
-                lon = _float2(parts[0]); lat = _float2(parts[1])
-                if lon is not None and lat is not None:
-                    pts.add((lon, lat))
-
-    return list(pts)
+                        lons.append(lon); lats.append(lat)
+            else:
+                # Placemark terminé : on vide le sous-arbre et on détache les frères déjà traités
+                el.clear()
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+
+    pts = np.column_stack([np.frombuffer(lons, dtype=np.float64), np.frombuffer(lats, dtype=np.float64)])
+    if blocks:
+        pts = np.concatenate([pts, *blocks])
+    # Dédoublonnage en un seul tri C : chaque (lon, lat) vu comme un complexe, np.unique 1-D
+    # (même ordre lexicographique que axis=0, ~3x plus rapide que la comparaison de lignes)
+    pts = np.unique(np.ascontiguousarray(pts).view(np.complex128).ravel()).view(np.float64).reshape(-1, 2)
+    pts.flags.writeable = False   # partagé via le cache
+    return pts
+
+def parse_kml_points(path: str) -> np.ndarray:
+    """Points (lon, lat) uniques du KML/KMZ, en tableau (N, 2)."""
+    path = _resolve_path(path)
+    return _parse_kml_cached(path, os.path.getmtime(path))
 
 # -------------------------
 #  Géométrie & endpoint
 # -------------------------
 
-def distance_meters_wgs84(lon1, lat1, lon2, lat2):
-    x1, y1 = _transform_wgs84_to_l93.transform(lon1, lat1)
-    x2, y2 = _transform_wgs84_to_l93.transform(lon2, lat2)
-    dx, dy = (x2 - x1), (y2 - y1)
-    return (dx * dx + dy * dy) ** 0.5
+# Distance orthodromique (haversine) : valable partout, y compris outre-mer où L93 est inadapté
+_EARTH_RADIUS_M = 6_371_008.8
 
-@app.get("/airport/check")
-async def airport_check(
-    lon: float = Query(...),
-    lat: float = Query(...),
-    buffer_m: float = Query(1000, ge=0),
-):
+def _unit_xyz(lon, lat) -> np.ndarray:
+    """Points WGS84 -> vecteurs unitaires 3D ; la corde entre deux points croît avec leur distance orthodromique."""
+    lon = np.radians(lon); lat = np.radians(lat)
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+def _chord_to_meters(chord: float) -> float:
+    """Corde sur la sphère unité -> distance haversine en mètres."""
+    return 2.0 * _EARTH_RADIUS_M * math.asin(min(chord / 2.0, 1.0))
+
+def _meters_to_chord(d: float) -> float:
+    """Distance haversine en mètres -> corde sur la sphère unité (bornée au diamètre)."""
+    return 2.0 * math.sin(min(d / (2.0 * _EARTH_RADIUS_M), math.pi / 2))
+
+# Index des aérodromes, chargé une seule fois : lon/lat WGS84 + KD-tree sur la sphère unité
+_AIRPORTS_LONLAT: np.ndarray | None = None
+_AIRPORTS_TREE: cKDTree | None = None
+
+def _airports_cache_path(src: str, mtime: float) -> str:
+    """Cache disque des points préparés, à côté du KML/KMZ et invalidé par son mtime."""
+    return f"{src}.{int(mtime)}.xyz.npz"
+
+def _load_airports() -> tuple[np.ndarray, cKDTree]:
+    """
+    Charge les aérodromes (lon/lat + vecteurs unitaires xyz) et construit le KD-tree.
+    Démarrage à froid : lecture du cache .npz si présent, sinon parse puis écriture du cache.
+    """
+    global _AIRPORTS_LONLAT, _AIRPORTS_TREE
+    if _AIRPORTS_TREE is not None:
+        return _AIRPORTS_LONLAT, _AIRPORTS_TREE
+
+    src = _resolve_path(CONFIG.aerodromes_kml)
+    cache = _airports_cache_path(src, os.path.getmtime(src))
+    try:
+        with np.load(cache) as data:
+            lonlat, xyz = data["lonlat"], data["xyz"]
+    except (OSError, KeyError, ValueError):
+        lonlat = parse_kml_points(src)
+        if not len(lonlat):
+            raise ValueError("Aucun point détecté (tags <coordinates> ou <gx:coord>).")
+        xyz = _unit_xyz(lonlat[:, 0], lonlat[:, 1])
+        try:
+            tmp = f"{cache}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                np.savez(fh, lonlat=lonlat, xyz=xyz)
+            os.replace(tmp, cache)  # écriture atomique (plusieurs workers)
+        except OSError:
+            pass  # système de fichiers en lecture seule : on se passe du cache disque
+
+    _AIRPORTS_LONLAT = lonlat
+    _AIRPORTS_TREE = cKDTree(xyz)
+    return _AIRPORTS_LONLAT, _AIRPORTS_TREE
+
+def _airports_or_500() -> tuple[np.ndarray, cKDTree]:
     try:
-        pts = parse_kml_points(CONFIG.aerodromes_kml)
+        return _load_airports()
     except FileNotFoundError:
         raise HTTPException(status_code=500, detail=f"Fichier KML/KMZ introuvable: {CONFIG.aerodromes_kml}")
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    if not pts:
-        raise HTTPException(status_code=500, detail="Aucun point détecté (tags <coordinates> ou <gx:coord>).")
-
-    dmin = None
-    closest = None
-    for (alon, alat) in pts:
-        d = distance_meters_wgs84(lon, lat, alon, alat)
-        if dmin is None or d < dmin:
-            dmin = d
-            closest = (alon, alat)
-
-    status = "KO" if (dmin is not None and dmin < buffer_m) else "OK"
+@app.get("/airport/check")
+async def airport_check(
+    lon: float = Query(...),
+    lat: float = Query(...),
+    buffer_m: float = Query(1000, ge=0),
+    nearest: bool = Query(True, description="Toujours renvoyer l'aérodrome le plus proche (False : recherche bornée au buffer)"),
+):
+    lonlat, tree = _airports_or_500()
+
+    # Plus proche voisin en O(log N)
+    q = _unit_xyz(lon, lat)
+    if not nearest:
+        # Recherche bornée : les branches hors buffer sont élaguées, réponse immédiate si rien à proximité
+        chord, idx = tree.query(q, k=1, distance_upper_bound=_meters_to_chord(buffer_m))
+        if math.isinf(chord):
+            return {"status": "OK", "distance_m": None, "closest_airport_latlon": None, "buffer_m": buffer_m}
+    else:
+        chord, idx = tree.query(q, k=1)
+    dmin = _chord_to_meters(float(chord))
+    closest = lonlat[int(idx)]
+
+    status = "KO" if dmin < buffer_m else "OK"
     return {
         "status": status,
-        "distance_m": round(dmin, 2) if dmin is not None else None,
-        "closest_airport_latlon": (closest[1], closest[0]) if closest else None,  # (lat, lon)
+        "distance_m": round(dmin, 2),
+        "closest_airport_latlon": (float(closest[1]), float(closest[0])),  # (lat, lon)
         "buffer_m": buffer_m,
     }
 
+_AIRPORT_BATCH_MAX = 10_000
+
+@app.post("/airport/check-batch")
+async def airport_check_batch(
+    points: List[Tuple[float, float]] = Body(..., description="Points [lon, lat] à vérifier"),
+    buffer_m: float = Query(1000, ge=0),
+):
+    """Même contrôle que /airport/check pour N points : une seule requête KD-tree vectorisée."""
+    if len(points) > _AIRPORT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Au plus {_AIRPORT_BATCH_MAX} points par requête")
+    lonlat, tree = _airports_or_500()
+    if not points:
+        return {"buffer_m": buffer_m, "results": []}
+
+    pts = np.asarray(points, dtype=np.float64)
+    chords, idx = tree.query(_unit_xyz(pts[:, 0], pts[:, 1]), k=1)
+    dists = 2.0 * _EARTH_RADIUS_M * np.arcsin(np.minimum(chords / 2.0, 1.0))  # cf. _chord_to_meters
+    closest = lonlat[idx]
+
+    results = [
+        {
+            "status": "KO" if d < buffer_m else "OK",
+            "distance_m": round(d, 2),
+            "closest_airport_latlon": (c_lat, c_lon),  # (lat, lon)
+        }
+        for d, (c_lon, c_lat) in zip(dists.tolist(), closest.tolist())
+    ]
+    return ORJSONResponse({"buffer_m": buffer_m, "results": results})
+
 # -------------------------
 #  Check PLU/RNU/CC/none
 # -------------------------
 
+# Réponses déterministes (le statut d'un point ne change qu'à la publication d'un document) :
+# cacheables par les proxies/navigateurs, avec un ETag du corps pour les revalidations en 304
 @app.get("/urbanisme/status/by-point")
-async def urbanisme_status_by_point(lon: float = Query(...), lat: float = Query(...)):
+async def urbanisme_status_by_point(request: Request, lon: float = Query(...), lat: float = Query(...)):
     base = CONFIG.gpu_base
     if not base:
         raise HTTPException(status_code=500, detail="GPU API non configuré dans config.py")
 
     geom = {"type": "Point", "coordinates": [lon, lat]}
-    async with httpx.AsyncClient(timeout=15) as client:
-        # Commune + info RNU
-        r_muni = await client.get(f"{base}/municipality", params={"geom": json.dumps(geom)})
-        r_muni.raise_for_status()
-        muni = (r_muni.json().get("features") or [])
-        if not muni:
-            return {"status": "Aucune commune trouvée", "details": {}}
-        mprops = muni[0].get("properties") or {}
-        insee = mprops.get("insee")
-        commune = mprops.get("name")
-        is_rnu = bool(mprops.get("is_rnu"))
-
-        if is_rnu:
-            return {"status": "RNU", "insee": insee, "commune": commune}
-
-        # Type de document d'urbanisme
-        r_doc = await client.get(f"{base}/document", params={"geom": json.dumps(geom)})
-        r_doc.raise_for_status()
-        docs = (r_doc.json().get("features") or [])
-        if not docs:
-            return {"status": "Aucun document d'urbanisme publié sur GPU", "insee": insee, "commune": commune}
-
-        dprops = docs[0].get("properties") or {}
-        du_type = (dprops.get("du_type") or "").upper()
-        doc_id = dprops.get("id")
-        partition = dprops.get("partition")
-
-        if du_type == "CC":
-            return {
-                "status": "Carte communale",
-                "insee": insee, "commune": commune,
-                "du_type": du_type, "partition": partition, "doc_id": doc_id
-            }
-
-        # Vérifier si zonage vectorisé disponible
-        r_zone = await client.get(f"{base}/zone-urba", params={"geom": json.dumps(geom)})
-        r_zone.raise_for_status()
-        zones = (r_zone.json().get("features") or [])
-        if not zones:
-            return {
-                "status": "Document trouvé mais zonage indisponible",
-                "insee": insee, "commune": commune,
-                "du_type": du_type, "partition": partition, "doc_id": doc_id
-            }
 
-        return {
-            "status": "Zonage disponible",
+    async def _features(path: str) -> list:
+        # Via le cache TTL de _gpu_get (clé : chemin + point arrondi ~1 m ; base = CONFIG.gpu_base)
+        return (await _gpu_get(path, geom))["features"]
+
+    # Commune (info RNU), document d'urbanisme et zonage vectorisé : indépendants, interrogés en parallèle.
+    # Chaque résultat n'est lu, et son erreur éventuelle remontée, que si la branche suivie l'exige.
+    muni, docs, zones = await asyncio.gather(
+        _features("municipality"), _features("document"), _features("zone-urba"), return_exceptions=True
+    )
+    if isinstance(muni, BaseException):
+        raise muni
+    if not muni:
+        # Pas de Cache-Control : cas d'erreur (hors territoire, réponse amont incomplète)
+        return {"status": "Aucune commune trouvée", "details": {}}
+    mprops = muni[0].get("properties") or {}
+    insee = mprops.get("insee")
+    commune = mprops.get("name")
+    is_rnu = bool(mprops.get("is_rnu"))
+
+    if is_rnu:
+        return _public_json(request, {"status": "RNU", "insee": insee, "commune": commune})
+
+    # Type de document d'urbanisme
+    if isinstance(docs, BaseException):
+        raise docs
+    if not docs:
+        return _public_json(request, {"status": "Aucun document d'urbanisme publié sur GPU", "insee": insee, "commune": commune})
+
+    dprops = docs[0].get("properties") or {}
+    du_type = (dprops.get("du_type") or "").upper()
+    doc_id = dprops.get("id")
+    partition = dprops.get("partition")
+
+    if du_type == "CC":
+        return _public_json(request, {
+            "status": "Carte communale",
             "insee": insee, "commune": commune,
             "du_type": du_type, "partition": partition, "doc_id": doc_id
-        }
+        })
+
+    # Vérifier si zonage vectorisé disponible
+    if isinstance(zones, BaseException):
+        raise zones
+    if not zones:
+        return _public_json(request, {
+            "status": "Document trouvé mais zonage indisponible",
+            "insee": insee, "commune": commune,
+            "du_type": du_type, "partition": partition, "doc_id": doc_id
+        })
+
+    return _public_json(request, {
+        "status": "Zonage disponible",
+        "insee": insee, "commune": commune,
+        "du_type": du_type, "partition": partition, "doc_id": doc_id
+    })
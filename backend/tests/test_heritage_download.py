@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+
+URL = "/heritage/download/by-point?lon=2.35&lat=48.85"
+
+
+class _UpstreamBody(httpx.AsyncByteStream):
+    """Corps amont en plusieurs morceaux ; mémorise sa fermeture."""
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Installe un client httpx simulé sur app.state.http (sans lifespan : ni KML ni warm-up réseau)."""
+    def _install(handler):
+        monkeypatch.setattr(main.app.state, "http", httpx.AsyncClient(transport=httpx.MockTransport(handler)), raising=False)
+    return _install
+
+
+def test_streams_archive_as_attachment(upstream):
+    body = _UpstreamBody([b"PK\x03\x04", b"x" * 100_000, b"y" * 100_000])
+    upstream(lambda req: httpx.Response(200, stream=body, headers={"content-type": "application/zip"}))
+
+    r = TestClient(main.app).get(URL)
+
+    assert r.status_code == 200
+    assert r.content == b"".join(body.chunks)
+    assert r.headers["content-type"] == "application/zip"
+    assert r.headers["content-disposition"] == 'attachment; filename="heritage.zip"'
+    assert body.closed
+
+
+@pytest.mark.parametrize("status", [404, 503])
+def test_upstream_error_is_502(upstream, status):
+    body = _UpstreamBody([b"erreur"])
+    upstream(lambda req: httpx.Response(status, stream=body))
+
+    r = TestClient(main.app).get(URL)
+
+    assert r.status_code == 502
+    assert body.closed
+
+
+def test_upstream_connection_error_is_502(upstream):
+    def handler(req):
+        raise httpx.ConnectError("refused", request=req)
+    upstream(handler)
+
+    assert TestClient(main.app).get(URL).status_code == 502
+
+
+def test_upstream_closed_on_client_disconnect(upstream):
+    body = _UpstreamBody([b"x" * 70_000] * 10)
+    upstream(lambda req: httpx.Response(200, stream=body, headers={"content-type": "application/zip"}))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "root_path": "",
+        "path": "/heritage/download/by-point", "raw_path": b"/heritage/download/by-point",
+        "query_string": b"lon=2.35&lat=48.85", "headers": [], "server": ("test", 80), "client": ("test", 1),
+    }
+    sent = []
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(message)
+            if len(sent) == 2:
+                raise OSError("client parti")  # coupure après le 1er morceau
+
+    async def run():
+        try:
+            await main.app(scope, receive, send)
+        except Exception:
+            pass
+        # Vérifié dans la boucle : asyncio.run finaliserait sinon le générateur à sa place
+        assert len(sent) == 2
+        assert body.closed
+
+    asyncio.run(run())